@@ -1,228 +1,344 @@
-import sqlite3
-import json
-import os
-from collections import Counter
-
-# Configuration
-DB_PATH = 'c:/My_Repo/SQL_TEST/crm_data.db'
-REPORT_PATH = 'c:/My_Repo/SQL_TEST/crm_eda_report.html'
-
-def get_table_data(cursor, table_name):
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns_info = cursor.fetchall()
-    col_names = [c[1] for c in columns_info]
-    
-    cursor.execute(f"SELECT * FROM {table_name}")
-    rows = cursor.fetchall()
-    
-    return col_names, rows
-
-def analyze_data(col_names, rows):
-    stats = {}
-    distributions = {}
-    
-    # Transpose rows to columns for analysis
-    cols_data = list(zip(*rows)) if rows else []
-    
-    for i, col_name in enumerate(col_names):
-        if not cols_data:
-            stats[col_name] = {"count": 0}
-            continue
-            
-        data = cols_data[i]
-        clean_data = [x for x in data if x is not None]
-        
-        # Basic Stats
-        col_stats = {
-            "count": len(data),
-            "missing": len(data) - len(clean_data),
-            "unique": len(set(clean_data))
-        }
-        
-        # Type inference (simple)
-        is_numeric = all(isinstance(x, (int, float)) for x in clean_data[:100]) if clean_data else False
-        
-        if is_numeric and clean_data:
-            col_stats['min'] = min(clean_data)
-            col_stats['max'] = max(clean_data)
-            col_stats['avg'] = sum(clean_data) / len(clean_data)
-            
-            # Histogram-ish data for chart
-            # Simple binning
-            min_val = min(clean_data)
-            max_val = max(clean_data)
-            range_val = max_val - min_val
-            if range_val == 0:
-                distributions[col_name] = {str(min_val): len(clean_data)}
-            else:
-                bins = 10
-                step = range_val / bins
-                hist = [0] * bins
-                labels = []
-                for b in range(bins):
-                    low = min_val + b * step
-                    high = low + step
-                    labels.append(f"{low:.1f}-{high:.1f}")
-                
-                for val in clean_data:
-                    idx = int((val - min_val) / step)
-                    if idx >= bins: idx = bins - 1
-                    hist[idx] += 1
-                
-                distributions[col_name] = dict(zip(labels, hist))
-                
-        else:
-            # Categorical - Top 10
-            counts = Counter(clean_data)
-            top_10 = dict(counts.most_common(10))
-            distributions[col_name] = top_10
-            
-        stats[col_name] = col_stats
-        
-    return stats, distributions
-
-def generate_html(tables_analysis):
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>CRM Data EDA Report</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        <style>
-            body { padding: 20px; font-family: sans-serif; background-color: #f8f9fa; }
-            .card { margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
-            .chart-container { position: relative; height: 300px; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1 class="text-center mb-5">CRM Database Exploratory Data Analysis</h1>
-    """
-    
-    chart_scripts = []
-    chart_id = 0
-    
-    for table_name, (stats, dists, sample_cols, sample_rows) in tables_analysis.items():
-        html += f"""
-        <div class="card">
-            <div class="card-header bg-primary text-white">
-                <h2 class="h4 mb-0">{table_name}</h2>
-            </div>
-            <div class="card-body">
-                <h5 class="card-title">Sample Data</h5>
-                <div class="table-responsive mb-4">
-                    <table class="table table-sm table-bordered">
-                        <thead><tr>{''.join(f'<th>{c}</th>' for c in sample_cols)}</tr></thead>
-                        <tbody>
-                            {''.join('<tr>' + ''.join(f'<td>{str(x)[:50]}</td>' for x in row) + '</tr>' for row in sample_rows)}
-                        </tbody>
-                    </table>
-                </div>
-                
-                <h5 class="card-title">Field Statistics</h5>
-                <div class="table-responsive mb-4">
-                    <table class="table table-striped table-sm">
-                        <thead><tr><th>Field</th><th>Count</th><th>Missing</th><th>Unique</th><th>Min</th><th>Max</th><th>Avg</th></tr></thead>
-                        <tbody>
-        """
-        
-        for col, s in stats.items():
-            html += f"""
-            <tr>
-                <td>{col}</td>
-                <td>{s['count']}</td>
-                <td>{s['missing']}</td>
-                <td>{s['unique']}</td>
-                <td>{s.get('min', '-')}</td>
-                <td>{s.get('max', '-')}</td>
-                <td>{f"{s.get('avg', 0):.2f}" if 'avg' in s else '-'}</td>
-            </tr>
-            """
-            
-        html += """
-                        </tbody>
-                    </table>
-                </div>
-                
-                <h5 class="card-title">Distributions (Top Fields)</h5>
-                <div class="row">
-        """
-        
-        for col, data in dists.items():
-            # Skip if unique count is too high (like IDs) unless it's numeric binning
-            if stats[col]['unique'] > 50 and 'min' not in stats[col]:
-                 continue
-                 
-            c_id = f"chart_{chart_id}"
-            chart_id += 1
-            
-            html += f"""
-            <div class="col-md-6 mb-4">
-                <div class="card h-100">
-                    <div class="card-body">
-                        <h6>{col}</h6>
-                        <div class="chart-container">
-                            <canvas id="{c_id}"></canvas>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """
-            
-            labels = list(data.keys())
-            values = list(data.values())
-            chart_type = 'bar'
-            
-            chart_scripts.append(f"""
-            new Chart(document.getElementById('{c_id}'), {{
-                type: '{chart_type}',
-                data: {{
-                    labels: {json.dumps(labels)},
-                    datasets: [{{
-                        label: 'Count',
-                        data: {json.dumps(values)},
-                        backgroundColor: 'rgba(54, 162, 235, 0.5)',
-                        borderColor: 'rgba(54, 162, 235, 1)',
-                        borderWidth: 1
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {{ y: {{ beginAtZero: true }} }}
-                }}
-            }});
-            """)
-            
-        html += "</div></div></div>"
-        
-    html += f"""
-        </div>
-        <script>
-            {''.join(chart_scripts)}
-        </script>
-    </body>
-    </html>
-    """
-    
-    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
-        f.write(html)
-    print(f"Report generated at {REPORT_PATH}")
-
-# Main execution
-conn = sqlite3.connect(DB_PATH)
-cursor = conn.cursor()
-
-tables = ['members', 'products', 'channels', 'campaigns', 'campaign_logs', 'transaction_details']
-analysis_results = {}
-
-for t in tables:
-    print(f"Processing {t}...")
-    cols, rows = get_table_data(cursor, t)
-    stats, dists = analyze_data(cols, rows)
-    sample_rows = rows[:5]
-    analysis_results[t] = (stats, dists, cols, sample_rows)
-
-generate_html(analysis_results)
-conn.close()
+import sqlite3
+import json
+import os
+import time
+from collections import Counter
+
+# Configuration
+DB_PATH = 'c:/My_Repo/SQL_TEST/crm_data.db'
+REPORT_PATH = 'c:/My_Repo/SQL_TEST/crm_eda_report.html'
+TIME_BUDGET_SEC = 30      # Soft wall-clock budget for table scans and distinct counts; phase 1
+                          # (PRAGMA, COUNT(*), sample) always runs and is never budgeted
+SAMPLE_SIZE = 1000        # Rows sampled per table to detect ID-like columns
+MAX_CHART_UNIQUE = 50     # Categorical columns above this cardinality get no chart
+
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def discover_tables(cursor):
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid")
+    return [r[0] for r in cursor.fetchall()]
+
+def get_table_metadata(cursor, table_name):
+    # Phase 1: cheap metadata - column list, row count, sample rows
+    t = quote_ident(table_name)
+    cursor.execute(f"PRAGMA table_info({t})")
+    columns_info = cursor.fetchall()
+    col_names = [c[1] for c in columns_info]
+    pk_cols = [c[1] for c in columns_info if c[5] > 0]
+
+    cursor.execute(f"SELECT COUNT(*) FROM {t}")
+    row_count = cursor.fetchone()[0]
+
+    cursor.execute(f"SELECT * FROM {t} LIMIT {SAMPLE_SIZE}")
+    sample = cursor.fetchall()
+
+    return {
+        "cols": col_names,
+        "pk": pk_cols if len(pk_cols) == 1 else [],  # Composite keys are not IDs on their own
+        "rows": row_count,
+        "sample": sample
+    }
+
+NUMERIC_TYPES = {int, float}
+
+def classify_columns(meta):
+    # Phase 1: guess each column's kind from the sample; the table scan confirms the type
+    kinds = {}
+    cols_data = list(zip(*meta["sample"])) if meta["sample"] else []
+    for i, col_name in enumerate(meta["cols"]):
+        clean = [x for x in cols_data[i] if x is not None] if cols_data else []
+        types = set(map(type, clean))
+
+        if not clean:
+            kind = "unknown"
+        elif bytes in types:
+            kind = "blob"
+        elif types <= NUMERIC_TYPES:
+            kind = "numeric"
+        elif (col_name in meta["pk"] and meta["rows"] > MAX_CHART_UNIQUE) or len(set(clean)) > MAX_CHART_UNIQUE:
+            # A primary key has one value per row, and a sample that already exceeds the
+            # limit can only grow - the chart would be dropped anyway, so skip the full scan
+            kind = "id_like"
+        else:
+            kind = "categorical"
+        kinds[col_name] = kind
+    return kinds
+
+def scan_table(cursor, table_name, r):
+    # One scan per table: values for chartable columns, only a NULL flag for the rest
+    scanned = [c for c in r["meta"]["cols"] if r["kinds"][c] not in ("id_like", "blob")]
+    flagged = [c for c in r["meta"]["cols"] if r["kinds"][c] in ("id_like", "blob")]
+    exprs = [quote_ident(c) for c in scanned] + [f"{quote_ident(c)} IS NULL" for c in flagged]
+    if not exprs:
+        return
+
+    cursor.execute(f"SELECT {', '.join(exprs)} FROM {quote_ident(table_name)}")
+    rows = cursor.fetchall()
+    cols_data = list(zip(*rows)) if rows else [()] * len(exprs)
+
+    for c, flags in zip(flagged, cols_data[len(scanned):]):
+        r["stats"][c]["missing"] = sum(flags)
+
+    for c, data in zip(scanned, cols_data):
+        s = r["stats"][c]
+        clean_data = [x for x in data if x is not None]
+        types = set(map(type, clean_data))
+        s["missing"] = len(data) - len(clean_data)
+        if not clean_data:
+            r["kinds"][c] = "categorical"
+            s["unique"] = 0
+        elif types <= NUMERIC_TYPES:
+            # Typed over the full column: SQLite allows mixed types, so the sample is not enough
+            r["kinds"][c] = "numeric"
+            s['min'] = min(clean_data)
+            s['max'] = max(clean_data)
+            s['avg'] = sum(clean_data) / len(clean_data)
+            r["dists"][c] = build_histogram(clean_data)
+        elif bytes in types:
+            # BLOBs are not chartable (nor JSON serialisable); count them in SQL like IDs
+            r["kinds"][c] = "blob"
+        else:
+            # Categorical - Top 10
+            r["kinds"][c] = "categorical"
+            counts = Counter(clean_data)
+            s["unique"] = len(counts)
+            if len(counts) <= MAX_CHART_UNIQUE:
+                # Sample may under-estimate cardinality; drop the chart but keep the stats
+                r["dists"][c] = dict(counts.most_common(10))
+
+def build_histogram(clean_data):
+    # Histogram-ish data for chart
+    # Simple binning
+    min_val = min(clean_data)
+    max_val = max(clean_data)
+    range_val = max_val - min_val
+    if range_val == 0:
+        return {str(min_val): len(clean_data)}
+
+    bins = 10
+    step = range_val / bins
+    hist = [0] * bins
+    labels = []
+    for b in range(bins):
+        low = min_val + b * step
+        high = low + step
+        labels.append(f"{low:.1f}-{high:.1f}")
+
+    for val in clean_data:
+        idx = int((val - min_val) / step)
+        if idx >= bins: idx = bins - 1
+        hist[idx] += 1
+
+    return dict(zip(labels, hist))
+
+def profile_database(cursor, tables, budget_sec):
+    """
+    Adaptive scheduler:
+      1. Metadata (columns, row count, sample) for every table - always done.
+      2. One scan per table for the chartable columns (types, missing, min/max/avg,
+         charts), smallest tables first, while its estimated cost fits the budget.
+      3. Exact distinct counts in SQL for numeric and ID-like columns, smallest tables
+         first, with whatever budget is left.
+    Costs are estimated from the time per row x column observed in earlier jobs of
+    the same phase. The budget is soft: a job estimated to fit may still overrun it.
+    """
+    deadline = time.monotonic() + budget_sec
+    results = {}
+
+    for t in tables:
+        print(f"Scanning {t}...")
+        meta = get_table_metadata(cursor, t)
+        kinds = classify_columns(meta)
+        stats = {c: {"count": meta["rows"]} for c in meta["cols"]}
+        results[t] = {"meta": meta, "kinds": kinds, "stats": stats, "dists": {}}
+
+    def run_jobs(jobs, work):
+        # jobs: (rows, cols, table); returns the number of jobs skipped
+        cost = {"cells": 0, "sec": 0.0}
+        skipped = 0
+        for rows, cols, t in sorted(jobs, key=lambda j: j[0] * len(j[1])):
+            remaining = deadline - time.monotonic()
+            cells = rows * len(cols)
+            if remaining <= 0 or (cost["cells"] and cells * cost["sec"] / cost["cells"] > remaining):
+                skipped += 1
+                continue
+            started = time.monotonic()
+            work(t, cols)
+            cost["cells"] += cells
+            cost["sec"] += time.monotonic() - started
+        return skipped
+
+    skipped = run_jobs([(r["meta"]["rows"], r["meta"]["cols"], t) for t, r in results.items()],
+                       lambda t, cols: scan_table(cursor, t, results[t]))
+
+    # Single-column primary key is unique by definition
+    distinct_jobs = []
+    for t, r in results.items():
+        cols = []
+        for c, k in r["kinds"].items():
+            s = r["stats"][c]
+            if c in r["meta"]["pk"]:
+                if "missing" in s:
+                    s["unique"] = s["count"] - s["missing"]
+            elif k in ("numeric", "id_like", "blob"):
+                cols.append(c)
+        if cols:
+            distinct_jobs.append((r["meta"]["rows"], cols, t))
+
+    def count_distinct(t, cols):
+        # Let SQLite count distinct values instead of building Python sets
+        exprs = ', '.join(f"COUNT(DISTINCT {quote_ident(c)})" for c in cols)
+        cursor.execute(f"SELECT {exprs} FROM {quote_ident(t)}")
+        for c, n in zip(cols, cursor.fetchone()):
+            results[t]["stats"][c]["unique"] = n
+
+    skipped += run_jobs(distinct_jobs, count_distinct)
+
+    if skipped:
+        print(f"Time budget of {budget_sec}s exhausted, {skipped} job(s) skipped.")
+    return results
+
+def generate_html(tables_analysis):
+    html = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>CRM Data EDA Report</title>
+        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+        <style>
+            body { padding: 20px; font-family: sans-serif; background-color: #f8f9fa; }
+            .card { margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
+            .chart-container { position: relative; height: 300px; }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1 class="text-center mb-5">CRM Database Exploratory Data Analysis</h1>
+    """
+    
+    chart_scripts = []
+    chart_id = 0
+    
+    for table_name, r in tables_analysis.items():
+        stats, dists = r["stats"], r["dists"]
+        sample_cols, sample_rows = r["meta"]["cols"], r["meta"]["sample"][:5]
+        html += f"""
+        <div class="card">
+            <div class="card-header bg-primary text-white">
+                <h2 class="h4 mb-0">{table_name}</h2>
+            </div>
+            <div class="card-body">
+                <h5 class="card-title">Sample Data</h5>
+                <div class="table-responsive mb-4">
+                    <table class="table table-sm table-bordered">
+                        <thead><tr>{''.join(f'<th>{c}</th>' for c in sample_cols)}</tr></thead>
+                        <tbody>
+                            {''.join('<tr>' + ''.join(f'<td>{str(x)[:50]}</td>' for x in row) + '</tr>' for row in sample_rows)}
+                        </tbody>
+                    </table>
+                </div>
+                
+                <h5 class="card-title">Field Statistics</h5>
+                <div class="table-responsive mb-4">
+                    <table class="table table-striped table-sm">
+                        <thead><tr><th>Field</th><th>Count</th><th>Missing</th><th>Unique</th><th>Min</th><th>Max</th><th>Avg</th></tr></thead>
+                        <tbody>
+        """
+        
+        for col, s in stats.items():
+            html += f"""
+            <tr>
+                <td>{col}</td>
+                <td>{s['count']}</td>
+                <td>{s.get('missing', '-')}</td>
+                <td>{s.get('unique', '-')}</td>
+                <td>{s.get('min', '-')}</td>
+                <td>{s.get('max', '-')}</td>
+                <td>{f"{s.get('avg', 0):.2f}" if 'avg' in s else '-'}</td>
+            </tr>
+            """
+            
+        html += """
+                        </tbody>
+                    </table>
+                </div>
+                
+                <h5 class="card-title">Distributions (Top Fields)</h5>
+                <div class="row">
+        """
+        
+        # ID-like / high-cardinality columns never get a distribution, see profile_database
+        for col in r["meta"]["cols"]:
+            # Schema order, independent of the order the scheduler profiled columns in
+            data = dists.get(col)
+            if data is None:
+                continue
+            c_id = f"chart_{chart_id}"
+            chart_id += 1
+            
+            html += f"""
+            <div class="col-md-6 mb-4">
+                <div class="card h-100">
+                    <div class="card-body">
+                        <h6>{col}</h6>
+                        <div class="chart-container">
+                            <canvas id="{c_id}"></canvas>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            """
+            
+            labels = list(data.keys())
+            values = list(data.values())
+            chart_type = 'bar'
+            
+            chart_scripts.append(f"""
+            new Chart(document.getElementById('{c_id}'), {{
+                type: '{chart_type}',
+                data: {{
+                    labels: {json.dumps(labels)},
+                    datasets: [{{
+                        label: 'Count',
+                        data: {json.dumps(values)},
+                        backgroundColor: 'rgba(54, 162, 235, 0.5)',
+                        borderColor: 'rgba(54, 162, 235, 1)',
+                        borderWidth: 1
+                    }}]
+                }},
+                options: {{
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    scales: {{ y: {{ beginAtZero: true }} }}
+                }}
+            }});
+            """)
+            
+        html += "</div></div></div>"
+        
+    html += f"""
+        </div>
+        <script>
+            {''.join(chart_scripts)}
+        </script>
+    </body>
+    </html>
+    """
+    
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f"Report generated at {REPORT_PATH}")
+
+# Main execution
+conn = sqlite3.connect(DB_PATH)
+cursor = conn.cursor()
+
+tables = discover_tables(cursor)
+print(f"Found {len(tables)} tables: {', '.join(tables)}")
+
+analysis_results = profile_database(cursor, tables, TIME_BUDGET_SEC)
+
+generate_html(analysis_results)
+conn.close()
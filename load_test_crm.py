@@ -0,0 +1,277 @@
+import sqlite3
+import random
+import math
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Configuration
+DB_PATH = 'c:/My_Repo/SQL_TEST/crm_data.db'
+POOL_TYPE = 'thread'      # 'thread' or 'process'
+CONCURRENCY = 8           # Number of workers, each with its own read-only connection
+NUM_QUERIES = 2000        # Total queries across all workers
+SEED = 42
+
+# Dashboard traffic mix (relative weights), see QUERIES below
+QUERY_MIX = {
+    'rfm_member': 20,
+    'campaign_response_member': 15,
+    'aov_by_channel': 12,
+    'product_ranking': 10,
+    'channel_performance': 8,
+    'category_margin': 8,
+    'payment_method': 5,
+    'market_basket': 5,
+    'sales_per_area': 5,
+    'demographics': 4,
+    'cohort_sales': 3,
+    'rfm_top_members': 2,
+    'campaign_click_to_purchase': 2,
+    'contact_fatigue': 1,
+}
+
+# Seasonality used by generate_crm_data.py: ~30% of transactions are re-rolled into Nov/Dec,
+# which makes each of those months roughly 3.5x as busy as any other month.
+MONTH_WEIGHTS = [1] * 10 + [3.5, 3.5]
+YEAR = 2023
+
+# ---------------------------------------------------------
+# 1. Analytical queries (from CRM_Schema_and_Analysis.md)
+# ---------------------------------------------------------
+QUERIES = {
+    # RFM for a single member
+    'rfm_member': """
+        SELECT member_id, MAX(transaction_date) AS recency, COUNT(DISTINCT transaction_id) AS frequency,
+               SUM(net_amount) AS monetary
+        FROM transaction_details
+        WHERE member_id = :member_id
+        GROUP BY member_id
+    """,
+    # Top RFM members within a period
+    'rfm_top_members': """
+        SELECT member_id, MAX(transaction_date) AS recency, COUNT(DISTINCT transaction_id) AS frequency,
+               SUM(net_amount) AS monetary
+        FROM transaction_details
+        WHERE transaction_date >= :start AND transaction_date < :end
+        GROUP BY member_id
+        ORDER BY monetary DESC
+        LIMIT 100
+    """,
+    # Average order value for a channel
+    'aov_by_channel': """
+        SELECT SUM(net_amount) / COUNT(DISTINCT transaction_id) AS aov
+        FROM transaction_details
+        WHERE channel_id = :channel_id AND transaction_date >= :start AND transaction_date < :end
+    """,
+    # Products frequently bought together with a given product
+    'market_basket': """
+        SELECT b.product_id, COUNT(*) AS pair_count
+        FROM transaction_details a
+        JOIN transaction_details b ON a.transaction_id = b.transaction_id AND a.product_id <> b.product_id
+        WHERE a.product_id = :product_id
+        GROUP BY b.product_id
+        ORDER BY pair_count DESC
+        LIMIT 10
+    """,
+    'payment_method': """
+        SELECT payment_method, COUNT(DISTINCT transaction_id) AS orders, SUM(net_amount) AS sales
+        FROM transaction_details
+        WHERE transaction_date >= :start AND transaction_date < :end
+        GROUP BY payment_method
+    """,
+    # Pareto / sales ranking
+    'product_ranking': """
+        SELECT product_id, SUM(net_amount) AS sales
+        FROM transaction_details
+        WHERE transaction_date >= :start AND transaction_date < :end
+        GROUP BY product_id
+        ORDER BY sales DESC
+    """,
+    'category_margin': """
+        SELECT p.category_l1, SUM(t.net_amount) AS sales, SUM(t.net_amount - p.cost * t.quantity) AS margin
+        FROM transaction_details t
+        JOIN products p ON t.product_id = p.product_id
+        WHERE t.transaction_date >= :start AND t.transaction_date < :end
+        GROUP BY p.category_l1
+    """,
+    'channel_performance': """
+        SELECT c.channel_type, c.region, SUM(t.net_amount) AS sales
+        FROM transaction_details t
+        JOIN channels c ON t.channel_id = c.channel_id
+        WHERE t.transaction_date >= :start AND t.transaction_date < :end
+        GROUP BY c.channel_type, c.region
+    """,
+    'sales_per_area': """
+        SELECT c.channel_id, SUM(t.net_amount) / c.store_area AS sales_per_area
+        FROM transaction_details t
+        JOIN channels c ON t.channel_id = c.channel_id
+        WHERE c.channel_type = 'Offline' AND t.transaction_date >= :start AND t.transaction_date < :end
+        GROUP BY c.channel_id
+    """,
+    'demographics': """
+        SELECT gender, city, COUNT(*) AS members
+        FROM members
+        GROUP BY gender, city
+    """,
+    # Sales in a period by registration cohort
+    'cohort_sales': """
+        SELECT substr(m.register_date, 1, 7) AS cohort, COUNT(DISTINCT t.member_id) AS active, SUM(t.net_amount) AS sales
+        FROM transaction_details t
+        JOIN members m ON t.member_id = m.member_id
+        WHERE t.transaction_date >= :start AND t.transaction_date < :end
+        GROUP BY cohort
+    """,
+    # Which campaign channel a member responds to
+    'campaign_response_member': """
+        SELECT c.channel_type, COUNT(*) AS sends, AVG(l.is_opened) AS open_rate, AVG(l.is_clicked) AS click_rate
+        FROM campaign_logs l
+        JOIN campaigns c ON l.campaign_id = c.campaign_id
+        WHERE l.member_id = :member_id
+        GROUP BY c.channel_type
+    """,
+    # Clicked members who purchased within 24 hours of the send
+    'campaign_click_to_purchase': """
+        SELECT COUNT(DISTINCT l.member_id) AS buyers
+        FROM campaign_logs l
+        JOIN transaction_details t ON t.member_id = l.member_id
+        WHERE l.campaign_id = :campaign_id AND l.is_clicked = 1
+          AND t.transaction_date >= l.send_time AND t.transaction_date < datetime(l.send_time, '+1 day')
+    """,
+    # Messages per member in a month
+    'contact_fatigue': """
+        SELECT member_id, COUNT(log_id) AS messages, AVG(is_opened) AS open_rate
+        FROM campaign_logs
+        WHERE send_time >= :start AND send_time < :end
+        GROUP BY member_id
+        ORDER BY messages DESC
+        LIMIT 100
+    """,
+}
+
+# ---------------------------------------------------------
+# 2. Parameter pools (same skew as generate_crm_data.py)
+# ---------------------------------------------------------
+def load_param_pools(db_path):
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+
+    # Order counts are independent of member_id in the generator, so members are uniform
+    cursor.execute("SELECT member_id FROM members")
+    member_ids = [r[0] for r in cursor.fetchall()]
+
+    # EC is 10x more likely than a single store
+    cursor.execute("SELECT channel_id, channel_type FROM channels")
+    channel_rows = cursor.fetchall()
+    channel_ids = [r[0] for r in channel_rows]
+    channel_weights = [50 if r[1] == 'Online' else 5 for r in channel_rows]
+
+    # The generator shuffles which 20% of products are popular, so recover them from sales
+    cursor.execute("""
+        SELECT p.product_id, COUNT(t.product_id) AS lines
+        FROM products p LEFT JOIN transaction_details t ON p.product_id = t.product_id
+        GROUP BY p.product_id
+        ORDER BY lines DESC
+    """)
+    product_ids = [r[0] for r in cursor.fetchall()]
+    n_popular = len(product_ids) // 5
+    product_weights = [10] * n_popular + [1] * (len(product_ids) - n_popular)
+
+    cursor.execute("SELECT campaign_id FROM campaigns")
+    campaign_ids = [r[0] for r in cursor.fetchall()]
+
+    conn.close()
+    return {
+        'member_ids': member_ids,
+        'channel_ids': channel_ids,
+        'channel_weights': channel_weights,
+        'product_ids': product_ids,
+        'product_weights': product_weights,
+        'campaign_ids': campaign_ids,
+    }
+
+def build_params(rng, pools):
+    # Superset of named parameters; sqlite3 ignores the ones a query does not use
+    month = rng.choices(range(1, 13), weights=MONTH_WEIGHTS, k=1)[0]
+    start = f"{YEAR}-{month:02d}-01"
+    end = f"{YEAR}-{month + 1:02d}-01" if month < 12 else f"{YEAR + 1}-01-01"
+    return {
+        'start': start,
+        'end': end,
+        'member_id': rng.choice(pools['member_ids']),
+        'channel_id': rng.choices(pools['channel_ids'], weights=pools['channel_weights'], k=1)[0],
+        'product_id': rng.choices(pools['product_ids'], weights=pools['product_weights'], k=1)[0],
+        'campaign_id': rng.choice(pools['campaign_ids']),
+    }
+
+# ---------------------------------------------------------
+# 3. Worker
+# ---------------------------------------------------------
+def run_worker(worker_id, num_queries, pools, db_path, seed):
+    # One read-only connection per worker; sqlite3 releases the GIL while a query runs
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+    rng = random.Random(seed + worker_id)
+
+    names = list(QUERY_MIX.keys())
+    weights = list(QUERY_MIX.values())
+    timings = []
+
+    for _ in range(num_queries):
+        name = rng.choices(names, weights=weights, k=1)[0]
+        params = build_params(rng, pools)
+        t0 = time.perf_counter()
+        cursor.execute(QUERIES[name], params)
+        cursor.fetchall()
+        timings.append((name, time.perf_counter() - t0))
+
+    conn.close()
+    return timings
+
+# ---------------------------------------------------------
+# 4. Reporting
+# ---------------------------------------------------------
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    idx = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[min(max(idx, 0), len(sorted_values) - 1)]
+
+def print_report(timings, elapsed):
+    by_query = defaultdict(list)
+    for name, latency in timings:
+        by_query[name].append(latency)
+
+    print(f"\nPool: {POOL_TYPE} x {CONCURRENCY}, {len(timings)} queries in {elapsed:.2f}s "
+          f"-> {len(timings) / elapsed:.1f} queries/s")
+    print(f"{'Query':<28}{'Count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+
+    rows = sorted(by_query.items(), key=lambda kv: -len(kv[1]))
+    rows.append(('ALL', [latency for _, latency in timings]))
+    for name, latencies in rows:
+        latencies.sort()
+        print(f"{name:<28}{len(latencies):>7}"
+              f"{percentile(latencies, 50) * 1000:>10.2f}"
+              f"{percentile(latencies, 95) * 1000:>10.2f}"
+              f"{percentile(latencies, 99) * 1000:>10.2f}")
+
+# Main execution (guarded so process pool workers can import this module)
+if __name__ == '__main__':
+    pools = load_param_pools(DB_PATH)
+    print(f"Loaded {len(pools['member_ids'])} members, {len(pools['channel_ids'])} channels, "
+          f"{len(pools['product_ids'])} products, {len(pools['campaign_ids'])} campaigns.")
+
+    # Split the total query count across workers
+    per_worker = [NUM_QUERIES // CONCURRENCY + (1 if i < NUM_QUERIES % CONCURRENCY else 0)
+                  for i in range(CONCURRENCY)]
+
+    executor_cls = ProcessPoolExecutor if POOL_TYPE == 'process' else ThreadPoolExecutor
+    timings = []
+    start_time = time.perf_counter()
+    with executor_cls(max_workers=CONCURRENCY) as executor:
+        futures = [executor.submit(run_worker, i, n, pools, DB_PATH, SEED) for i, n in enumerate(per_worker)]
+        for f in futures:
+            timings.extend(f.result())
+    elapsed = time.perf_counter() - start_time
+
+    print_report(timings, elapsed)